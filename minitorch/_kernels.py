@@ -0,0 +1,177 @@
+"""
+NUMBA kernels for the elementary functions in `operators.py`.
+
+The scalar kernels are the Python definitions from `operators.py`
+compiled as they are, so the two cannot drift apart. The branches in
+`relu` / `relu_back` are simple enough for LLVM to turn into a `select`
+(a SIMD blend), so the loops still vectorize. The `_vec` kernels apply
+them over a contiguous float array (in parallel for large inputs) and
+write into a preallocated `out`; `operators.map` / `operators.zipWith`
+dispatch to them for the matching primitives.
+
+Like NumPy, the kernels return inf or nan where the Python functions
+raise: `log` of a negative number, `exp` overflowing, division by zero.
+`operators.map` / `operators.zipWith` recompute any result that is not
+all finite with the Python functions, which raise as usual.
+
+Nothing is compiled with `fastmath`: it lets LLVM assume there are no
+NaN or inf values, which would make the array results differ from the
+scalar functions on non-finite inputs.
+"""
+
+from __future__ import annotations
+
+import types
+from typing import Any, Callable
+
+import numpy as np
+from numba import njit, prange
+
+# `operators` imports this module once its scalar functions are defined
+# (and before the optional compiled versions replace them), so the names
+# below are the pure Python definitions.
+from . import operators
+
+# Scalar kernels.
+
+
+def _scalar(fn: Callable[..., float]) -> Callable[..., float]:
+    # The "numpy" error model returns inf / nan on division by zero instead
+    # of raising, which the prange loops below cannot propagate.
+    return njit(cache=True, error_model="numpy")(fn)
+
+
+_sigmoid_scalar = _scalar(operators.sigmoid)
+_relu_scalar = _scalar(operators.relu)
+_log_scalar = _scalar(operators.log)
+_exp_scalar = _scalar(operators.exp)
+_log_back_scalar = _scalar(operators.log_back)
+_inv_back_scalar = _scalar(operators.inv_back)
+_relu_back_scalar = _scalar(operators.relu_back)
+
+
+# Array kernels.
+
+
+def _sigmoid_loop(x: np.ndarray, out: np.ndarray) -> None:
+    for i in prange(x.size):
+        out[i] = _sigmoid_scalar(x[i])
+
+
+def _relu_loop(x: np.ndarray, out: np.ndarray) -> None:
+    for i in prange(x.size):
+        out[i] = _relu_scalar(x[i])
+
+
+def _log_loop(x: np.ndarray, out: np.ndarray) -> None:
+    for i in prange(x.size):
+        out[i] = _log_scalar(x[i])
+
+
+def _exp_loop(x: np.ndarray, out: np.ndarray) -> None:
+    for i in prange(x.size):
+        out[i] = _exp_scalar(x[i])
+
+
+def _log_back_loop(x: np.ndarray, d: np.ndarray, out: np.ndarray) -> None:
+    for i in prange(x.size):
+        out[i] = _log_back_scalar(x[i], d[i])
+
+
+def _inv_back_loop(x: np.ndarray, d: np.ndarray, out: np.ndarray) -> None:
+    for i in prange(x.size):
+        out[i] = _inv_back_scalar(x[i], d[i])
+
+
+def _relu_back_loop(x: np.ndarray, d: np.ndarray, out: np.ndarray) -> None:
+    for i in prange(x.size):
+        out[i] = _relu_back_scalar(x[i], d[i])
+
+
+# Below this size starting the thread pool costs more than the parallel
+# loop saves, so the serial compilation of the same loop is used.
+_PARALLEL_MIN_SIZE = 16384
+
+
+class _Kernel:
+    """
+    A `_loop` function compiled serially and in parallel, running the
+    variant that suits the input size.
+
+    NUMBA names the on-disk cache after the function's qualified name and
+    does not key it on `parallel`, so compiling the same function object
+    both ways would let one variant load the other's machine code. The
+    parallel variant is compiled from a copy with its own name instead.
+
+    Args:
+        loop: one of the `_loop` functions above; its first argument is the input array.
+    """
+
+    def __init__(self, loop: Callable[..., None]) -> None:
+        parallel_loop = types.FunctionType(
+            loop.__code__, loop.__globals__, loop.__name__, loop.__defaults__
+        )
+        parallel_loop.__qualname__ = loop.__qualname__ + "_parallel"
+        self.serial = njit(cache=True)(loop)
+        self.parallel = njit(parallel=True, cache=True)(parallel_loop)
+
+    def __call__(self, x: np.ndarray, *args: Any) -> None:
+        if x.size < _PARALLEL_MIN_SIZE:
+            self.serial(x, *args)
+        else:
+            self.parallel(x, *args)
+
+
+_sigmoid_vec = _Kernel(_sigmoid_loop)
+_relu_vec = _Kernel(_relu_loop)
+_log_vec = _Kernel(_log_loop)
+_exp_vec = _Kernel(_exp_loop)
+_log_back_vec = _Kernel(_log_back_loop)
+_inv_back_vec = _Kernel(_inv_back_loop)
+_relu_back_vec = _Kernel(_relu_back_loop)
+
+
+# Wrappers used by the fast paths in `operators.py`.
+
+
+def unary(kernel: Callable[..., None]) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Wrap an array kernel `kernel(x, out)` as a function from arrays to arrays.
+
+    Args:
+        kernel: one of the `_vec` kernels above taking a single input.
+
+    Returns:
+        Function that allocates `out` and runs `kernel` over its input.
+    """
+
+    def apply(x: np.ndarray) -> np.ndarray:
+        x = np.ascontiguousarray(x, dtype=np.float64)
+        out = np.empty_like(x)
+        kernel(x, out)
+        return out
+
+    return apply
+
+
+def binary(
+    kernel: Callable[..., None]
+) -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
+    """
+    Wrap an array kernel `kernel(x, d, out)` as a function from arrays to arrays.
+
+    Args:
+        kernel: one of the `_vec` kernels above taking two inputs.
+
+    Returns:
+        Function that allocates `out` and runs `kernel` over its inputs.
+    """
+
+    def apply(x: np.ndarray, d: np.ndarray) -> np.ndarray:
+        x = np.ascontiguousarray(x, dtype=np.float64)
+        d = np.ascontiguousarray(d, dtype=np.float64)
+        out = np.empty_like(x)
+        kernel(x, d, out)
+        return out
+
+    return apply
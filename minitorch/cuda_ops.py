@@ -3,6 +3,7 @@ from typing import Callable, Optional
 import numba
 from numba import cuda
 
+from . import operators
 from .tensor import Tensor
 from .tensor_data import (
     MAX_DIMS,
@@ -34,7 +35,7 @@ class CudaOps(TensorOps):
     @staticmethod
     def map(fn: Callable[[float], float]) -> MapProto:
         "See `tensor_ops.py`"
-        f = tensor_map(cuda.jit(device=True)(fn))
+        f = tensor_map(cuda.jit(device=True)(operators.python_impl(fn)))
 
         def ret(a: Tensor, out: Optional[Tensor] = None) -> Tensor:
             if out is None:
@@ -50,7 +51,7 @@ class CudaOps(TensorOps):
 
     @staticmethod
     def zip(fn: Callable[[float, float], float]) -> Callable[[Tensor, Tensor], Tensor]:
-        f = tensor_zip(cuda.jit(device=True)(fn))
+        f = tensor_zip(cuda.jit(device=True)(operators.python_impl(fn)))
 
         def ret(a: Tensor, b: Tensor) -> Tensor:
             c_shape = shape_broadcast(a.shape, b.shape)
@@ -68,7 +69,7 @@ class CudaOps(TensorOps):
     def reduce(
         fn: Callable[[float, float], float], start: float = 0.0
     ) -> Callable[[Tensor, int], Tensor]:
-        f = tensor_reduce(cuda.jit(device=True)(fn))
+        f = tensor_reduce(cuda.jit(device=True)(operators.python_impl(fn)))
 
         def ret(a: Tensor, dim: int) -> Tensor:
             out_shape = list(a.shape)
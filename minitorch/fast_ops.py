@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING
 import numpy as np
 from numba import njit, prange
 
+from . import operators
 from .tensor_data import (
     MAX_DIMS,
     broadcast_index,
@@ -36,7 +37,7 @@ class FastOps(TensorOps):
         "See `tensor_ops.py`"
 
         # This line JIT compiles your tensor_map
-        f = tensor_map(njit()(fn))
+        f = tensor_map(njit()(operators.python_impl(fn)))
 
         def ret(a: Tensor, out: Optional[Tensor] = None) -> Tensor:
             if out is None:
@@ -50,7 +51,7 @@ class FastOps(TensorOps):
     def zip(fn: Callable[[float, float], float]) -> Callable[[Tensor, Tensor], Tensor]:
         "See `tensor_ops.py`"
 
-        f = tensor_zip(njit()(fn))
+        f = tensor_zip(njit()(operators.python_impl(fn)))
 
         def ret(a: Tensor, b: Tensor) -> Tensor:
             c_shape = shape_broadcast(a.shape, b.shape)
@@ -65,7 +66,7 @@ class FastOps(TensorOps):
         fn: Callable[[float, float], float], start: float = 0.0
     ) -> Callable[[Tensor, int], Tensor]:
         "See `tensor_ops.py`"
-        f = tensor_reduce(njit()(fn))
+        f = tensor_reduce(njit()(operators.python_impl(fn)))
 
         def ret(a: Tensor, dim: int) -> Tensor:
             out_shape = list(a.shape)
@@ -1,8 +1,36 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional, Sequence, Tuple
-
-from collections import deque
+import sys
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+import numpy.typing as npt
+
+# Writes to the bookkeeping slots of `Module` bypass `Module.__setattr__`,
+# whose type dispatch is meant for user assignments and would otherwise run
+# for each of them.
+_set_slot = object.__setattr__
+
+# Bumped by every `Module._invalidate_caches`, so a traversal can tell
+# whether a tree changed while it ran. A module global rather than a class
+# attribute: assigning to a class attribute invalidates the type's
+# attribute cache.
+_generation = 0
 
 
 class Module:
@@ -14,22 +42,115 @@ class Module:
         _modules : Storage of the child modules
         _parameters : Storage of the module's parameters
         training : Whether the module is in training mode or evaluation mode
+        _parents : Weak references to every module this one is a child of,
+            or None until it is first assigned as a child
+        _param_cache : Memoized result of `parameters()`, or None
+        _named_param_cache : Memoized result of `named_parameters()`, or None
+        _repr_cache : Memoized result of `repr()`, or None
+        _name_cache : Interned full parameter names keyed by (prefix, name)
+        _frozen : Whether the topology is fixed by `freeze()`
+        _params_tuple : Snapshot of `_parameters.items()` taken by `freeze()`
+        _modules_tuple : Snapshot of `_modules.items()` taken by `freeze()`
 
     """
 
+    # The tree bookkeeping lives in slots; `__dict__` stays available for
+    # ordinary user attributes.
+    __slots__ = (
+        "_modules",
+        "_parameters",
+        "training",
+        "_parents",
+        "_param_cache",
+        "_named_param_cache",
+        "_repr_cache",
+        "_name_cache",
+        "_frozen",
+        "_params_tuple",
+        "_modules_tuple",
+        "__dict__",
+        "__weakref__",
+    )
+
     _modules: Dict[str, Module]
     _parameters: Dict[str, Parameter]
     training: bool
+    _parents: Optional[List[weakref.ref[Module]]]
+    _param_cache: Optional[List[Parameter]]
+    _named_param_cache: Optional[List[Tuple[str, Parameter]]]
+    _repr_cache: Optional[str]
+    _name_cache: Optional[Dict[Tuple[str, str], str]]
+    _frozen: bool
+    _params_tuple: Tuple[Tuple[str, Parameter], ...]
+    _modules_tuple: Tuple[Tuple[str, Module], ...]
+
+    # Shared by every module for `parallel_forward`; created on first use.
+    _executor: ClassVar[Optional[ThreadPoolExecutor]] = None
+    _executor_lock: ClassVar[threading.Lock] = threading.Lock()
 
     def __init__(self) -> None:
-        self._modules = {}
-        self._parameters = {}
-        self.training = True
+        self._init_slots({}, {}, True)
+
+    def _init_slots(
+        self,
+        modules: Dict[str, Module],
+        parameters: Dict[str, Parameter],
+        training: bool,
+    ) -> None:
+        _set_slot(self, "_modules", modules)
+        _set_slot(self, "_parameters", parameters)
+        _set_slot(self, "training", training)
+        _set_slot(self, "_parents", None)
+        _set_slot(self, "_name_cache", None)
+        _set_slot(self, "_param_cache", None)
+        _set_slot(self, "_named_param_cache", None)
+        _set_slot(self, "_repr_cache", None)
+        self._unfreeze()
+
+    def _unfreeze(self) -> None:
+        _set_slot(self, "_frozen", False)
+        _set_slot(self, "_params_tuple", ())
+        _set_slot(self, "_modules_tuple", ())
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        _SETATTR_TABLE[cls] = _set_module
+
+    def _reset_caches(self) -> None:
+        # Reading a slot is much cheaper than writing one, and while a tree is
+        # being built there is usually nothing cached.
+        if self._param_cache is not None:
+            _set_slot(self, "_param_cache", None)
+        if self._named_param_cache is not None:
+            _set_slot(self, "_named_param_cache", None)
+        if self._repr_cache is not None:
+            _set_slot(self, "_repr_cache", None)
+
+    def _invalidate_caches(self) -> None:
+        """
+        Drop the memoized traversals of this module and of every ancestor
+        reachable through `_parents`, since all of them include this subtree.
+        """
+        global _generation
+        _generation += 1
+        self._reset_caches()
+        if self._parents is None:
+            # Not (yet) part of a larger tree, e.g. while `__init__` runs.
+            return
+        seen = {id(self)}
+        stack = [self]
+        while stack:
+            m = stack.pop()
+            for ref in m._parents or ():
+                parent = ref()
+                if parent is not None and id(parent) not in seen:
+                    seen.add(id(parent))
+                    parent._reset_caches()
+                    stack.append(parent)
 
     def modules(self) -> Sequence[Module]:
         "Return the direct child modules of this module."
-        m: Dict[str, Module] = self.__dict__["_modules"]
-        return list(m.values())
+        return list(self._modules.values())
 
     def named_children(self) -> Sequence[Tuple[str, Module]]:
         """
@@ -39,77 +160,165 @@ class Module:
         Returns:
             [(name, ChildModule) for all name, child in self]
         """
-        m: Dict[str, Module] = self.__dict__["_modules"]
-        to_return = [(name, mod) for name, mod in m.items()]
-        return to_return
+        return list(self._modules.items())
 
     def train(self) -> None:
         """
         Set the mode of this module and all descendent modules to `train`.
+
+        Also undoes `freeze()`.
         """
-        self.training = True
-        to_set = deque(self.modules())
-        while len(to_set) > 0:
-            mChild = to_set.popleft()
-            mChild.training = True
-            to_set.extend(mChild.modules())
+        stack = [self]
+        while stack:
+            m = stack.pop()
+            _set_slot(m, "training", True)
+            if m._frozen:
+                m._unfreeze()
+            stack.extend(m._modules.values())
 
     def eval(self) -> None:
         "Set the mode of this module and all descendent modules to `eval`."
-        self.training = False
-        to_set = deque(self.modules())
-        while len(to_set) > 0:
-            mChild = to_set.popleft()
-            mChild.training = False
-            to_set.extend(mChild.modules())
+        stack = [self]
+        while stack:
+            m = stack.pop()
+            _set_slot(m, "training", False)
+            stack.extend(m._modules.values())
 
-    def named_parameters(self) -> Sequence[Tuple[str, Parameter]]:
-        """
-        Collect all the parameters of this module and its descendents.
-        Returns:
-            The name and `Parameter` of each ancestor parameter.
+    def freeze(self) -> None:
         """
-        self_params: Dict[str, Parameter] = self.__dict__["_parameters"]
-        params = [(n, p) for n, p in self_params.items()]
+        Fix the topology of this module and all descendent modules, e.g. for
+        inference.
 
-        to_add = deque(self.named_children())
-        while len(to_add) > 0:
-            name, mChild = to_add.popleft()
-            mChild_params: Dict[str, Parameter] = mChild.__dict__["_parameters"]
-
-            for n, p in mChild_params.items():
-                params.append((f"{name}.{n}", p))
-
-            extended_names = []
-            for n, m in mChild.named_children():
-                n = f"{name}.{n}"
-                extended_names.append((n, m))
+        Each module snapshots its parameters and children as tuples, which
+        `named_parameters()` then iterates instead of the dicts. Assigning a
+        `Parameter` or `Module` to a frozen module raises `RuntimeError`;
+        `train()` unfreezes the tree.
+        """
+        stack = [self]
+        while stack:
+            m = stack.pop()
+            _set_slot(m, "_params_tuple", tuple(m._parameters.items()))
+            _set_slot(m, "_modules_tuple", tuple(m._modules.items()))
+            _set_slot(m, "_frozen", True)
+            stack.extend(m._modules.values())
+
+    def named_parameters(self) -> Iterator[Tuple[str, Parameter]]:
+        """
+        Collect all the parameters of this module and its descendents.
 
-            to_add.extend(extended_names)
+        This is a generator; use `list(module.named_parameters())` when the
+        result needs to be indexed or traversed more than once.
 
-        return params
+        Yields:
+            The name and `Parameter` of each ancestor parameter.
+        """
+        cache = self._named_param_cache
+        if cache is not None:
+            yield from cache
+            return
+
+        # A full name depends only on (prefix, name), so unlike the caches
+        # above this one never goes stale. Interned names make repeated
+        # traversals hand out the same string objects, which keeps lookups
+        # in name-keyed dicts (e.g. state dicts) on the identity fast path.
+        names = self._name_cache
+        if names is None:
+            names = {}
+            _set_slot(self, "_name_cache", names)
+
+        generation = _generation
+        params: List[Tuple[str, Parameter]] = []
+        stack: List[Tuple[str, Module]] = [("", self)]
+        while stack:
+            prefix, m = stack.pop()
+            if m._frozen:
+                m_params: Iterable[Tuple[str, Parameter]] = m._params_tuple
+                m_modules: Iterable[Tuple[str, Module]] = m._modules_tuple
+            else:
+                m_params = m._parameters.items()
+                m_modules = m._modules.items()
+            for n, p in m_params:
+                key = (prefix, n)
+                full = names.get(key)
+                if full is None:
+                    full = names[key] = sys.intern(prefix + n)
+                item = (full, p)
+                params.append(item)
+                yield item
+            for n, child in m_modules:
+                stack.append((prefix + n + ".", child))
+
+        # Only a complete traversal of a tree that did not change while the
+        # caller was iterating is worth keeping.
+        if _generation == generation:
+            _set_slot(self, "_named_param_cache", params)
 
     def parameters(self) -> Sequence[Parameter]:
         """
         Enumerate over all the parameters of this module and its descendents.
 
+        The list is memoized until the tree changes and is shared between
+        calls, so callers should not modify it.
+
         Returns:
             A list of all parameters from this module and its descendents
         """
-        self_params: Dict[str, Parameter] = self.__dict__["_parameters"]
-        params = [param for param in self_params.values()]
-        to_add = deque(self.modules())
-
-        while len(to_add) > 0:
-            mChild = to_add.popleft()
-            mChild_params: Dict[str, Parameter] = mChild.__dict__["_parameters"]
+        if self._param_cache is not None:
+            return self._param_cache
+
+        # A frozen module's dicts cannot change, and extending from their
+        # views is faster than unpacking the (name, value) snapshot tuples.
+        params: List[Parameter] = []
+        stack: List[Module] = [self]
+        while stack:
+            m = stack.pop()
+            params.extend(m._parameters.values())
+            stack.extend(m._modules.values())
+
+        _set_slot(self, "_param_cache", params)
+        return params
 
-            for p in mChild_params.values():
-                params.append(p)
+    def pack_parameters(self, dtype: npt.DTypeLike = np.float64) -> ParameterPack:
+        """
+        Move all floating-point parameter values of this module and its
+        descendents into one contiguous array.
+
+        Each packed `Parameter` keeps a 0-d view into `values`, so updating
+        the pack (e.g. `pack.step(lr)`) updates every parameter in one
+        vectorized operation. Parameters holding anything else (`int`,
+        `bool`, `Scalar`, `Tensor`, ...) are left untouched, since storing
+        them as floats would change their type. A parameter reachable under
+        several names (through a shared child) is packed once, under the
+        first name `named_parameters()` gives it. Calling `Parameter.update`
+        on a packed parameter detaches it from the pack.
 
-            to_add.extend(mChild.modules())
+        Args:
+            dtype: dtype of the packed storage.
 
-        return params
+        Returns:
+            The pack holding the values and a matching zeroed `grads` array.
+        """
+        seen = set()
+        named = []
+        for n, p in self.named_parameters():
+            if id(p) in seen:
+                continue
+            seen.add(id(p))
+            if isinstance(p.value, (float, np.floating)) or (
+                isinstance(p.value, np.ndarray)
+                and p.value.ndim == 0
+                and p.value.dtype.kind == "f"
+            ):
+                named.append((n, p))
+        values = np.array([p.value for _, p in named], dtype=dtype)
+        for i, (_, p) in enumerate(named):
+            p.value = values[i, ...]
+        return ParameterPack(
+            names=[n for n, _ in named],
+            parameters=[p for _, p in named],
+            values=values,
+            grads=np.zeros_like(values),
+        )
 
     def add_parameter(self, k: str, v: Any) -> Parameter:
         """
@@ -122,39 +331,93 @@ class Module:
         Returns:
             Newly created parameter.
         """
+        _check_not_frozen(self, k)
         val = Parameter(v, k)
-        self.__dict__["_parameters"][k] = val
+        self._parameters[k] = val
+        self._invalidate_caches()
         return val
 
     def __setattr__(self, key: str, val: Parameter) -> None:
-        if isinstance(val, Parameter):
-            self.__dict__["_parameters"][key] = val
-        elif isinstance(val, Module):
-            self.__dict__["_modules"][key] = val
-        else:
-            super().__setattr__(key, val)
+        # Dispatch on the exact type; see `_SETATTR_TABLE`.
+        handler = _SETATTR_TABLE.get(type(val))
+        if handler is None:
+            handler = _setattr_handler(type(val))
+        handler(self, key, val)
 
     def __getattr__(self, key: str) -> Any:
-        if key in self.__dict__["_parameters"]:
-            return self.__dict__["_parameters"][key]
+        # Only reached for slots that were never assigned (e.g. before
+        # `__init__` ran); looking them up again below would recurse.
+        if key in Module.__slots__:
+            raise AttributeError(key)
+
+        # Stored values are never None, so one `get` per dict suffices.
+        val: Any = self._parameters.get(key)
+        if val is None:
+            val = self._modules.get(key)
+        return val
 
-        if key in self.__dict__["_modules"]:
-            return self.__dict__["_modules"][key]
-        return None
+    def __getstate__(self) -> Dict[str, Any]:
+        # Weak references cannot be pickled; caches and `_parents` links are
+        # rebuilt in `__setstate__`.
+        return {
+            "__dict__": self.__dict__,
+            "_modules": self._modules,
+            "_parameters": self._parameters,
+            "training": self.training,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state["__dict__"])
+        self._init_slots(state["_modules"], state["_parameters"], state["training"])
+        for child in self._modules.values():
+            _add_parent(child, self)
 
     def __call__(self, *args: Any, **kwargs: Any) -> Any:
         return self.forward(*args, **kwargs)
 
+    def parallel_forward(self, names: Sequence[str], x: Any) -> List[Any]:
+        """
+        Call several independent child modules on the same input.
+
+        On a free-threaded (no-GIL) Python the children run concurrently on a
+        shared thread pool; otherwise, where threads would only contend for
+        the GIL, they run one after another. Either way the speedup only
+        shows when the children's forward spends its time outside the
+        interpreter lock, e.g. in NumPy or compiled kernels. Nested calls made
+        from a child already running on the pool also run one after another,
+        since waiting on the pool from one of its own workers can deadlock.
+
+        Args:
+            names: Local names of the child modules to call.
+            x: Input passed to every child.
+
+        Returns:
+            The output of each child, in the order of `names`.
+        """
+        children = [self._modules[n] for n in names]
+        if (
+            len(children) < 2
+            or getattr(_pool_worker, "active", False)
+            or getattr(sys, "_is_gil_enabled", lambda: True)()
+        ):
+            return [child(x) for child in children]
+
+        executor = Module._executor
+        if executor is None:
+            with Module._executor_lock:
+                if Module._executor is None:
+                    Module._executor = ThreadPoolExecutor()
+                executor = Module._executor
+        futures = [executor.submit(_run_on_pool, child, x) for child in children]
+        return [f.result() for f in futures]
+
     def __repr__(self) -> str:
+        if self._repr_cache is not None:
+            return self._repr_cache
+
         def _addindent(s_: str, numSpaces: int) -> str:
-            s2 = s_.split("\n")
-            if len(s2) == 1:
-                return s_
-            first = s2.pop(0)
-            s2 = [(numSpaces * " ") + line for line in s2]
-            s = "\n".join(s2)
-            s = first + "\n" + s
-            return s
+            # Indent every line but the first.
+            return s_.replace("\n", "\n" + numSpaces * " ")
 
         child_lines = []
 
@@ -170,9 +433,27 @@ class Module:
             main_str += "\n  " + "\n  ".join(lines) + "\n"
 
         main_str += ")"
+        _set_slot(self, "_repr_cache", main_str)
         return main_str
 
 
+# Set on the threads of `Module._executor` so that `parallel_forward` called
+# from inside a child does not block a worker waiting on the same pool.
+_pool_worker = threading.local()
+
+
+def _run_on_pool(child: Module, x: Any) -> Any:
+    # Pool threads only ever run these calls, so the flag is never cleared.
+    _pool_worker.active = True
+    return child(x)
+
+
+# Whether values of a given type take part in autodiff (have
+# `requires_grad_`); `Parameter.update` runs once per parameter per step,
+# so the answer is remembered per type instead of calling `hasattr`.
+_HAS_REQUIRES_GRAD: Dict[type, bool] = {}
+
+
 class Parameter:
     """
     A Parameter is a special container stored in a `Module`.
@@ -181,24 +462,110 @@ class Parameter:
     any value for testing.
     """
 
+    __slots__ = ("value", "name")
+
     def __init__(self, x: Any, name: Optional[str] = None) -> None:
-        self.value = x
         self.name = name
-        if hasattr(x, "requires_grad_"):
-            self.value.requires_grad_(True)
-            if self.name:
-                self.value.name = self.name
+        self.update(x)
 
     def update(self, x: Any) -> None:
         "Update the parameter value."
         self.value = x
-        if hasattr(x, "requires_grad_"):
-            self.value.requires_grad_(True)
+        t = type(x)
+        needs_grad = _HAS_REQUIRES_GRAD.get(t)
+        if needs_grad is None:
+            needs_grad = hasattr(t, "requires_grad_")
+            _HAS_REQUIRES_GRAD[t] = needs_grad
+        if needs_grad:
+            x.requires_grad_(True)
             if self.name:
-                self.value.name = self.name
+                x.name = self.name
 
     def __repr__(self) -> str:
         return repr(self.value)
 
     def __str__(self) -> str:
         return str(self.value)
+
+
+@dataclass
+class ParameterPack:
+    """
+    Float parameter values stored structure-of-arrays style, as built by
+    `Module.pack_parameters`.
+
+    Attributes:
+        names : Full name of each packed parameter
+        parameters : The packed `Parameter` objects, in the same order
+        values : Contiguous storage; `parameters[i].value` is a view of `values[i]`
+        grads : Gradient buffer with the same shape as `values`, filled by the caller
+    """
+
+    names: List[str]
+    parameters: List[Parameter]
+    values: npt.NDArray[Any]
+    grads: npt.NDArray[Any]
+
+    def step(self, lr: float) -> None:
+        "Apply one SGD update, `values -= lr * grads`, to all packed parameters."
+        self.values -= lr * self.grads
+
+
+# `Module.__setattr__` handlers, keyed by the exact type of the value so the
+# common case is one dict lookup instead of `isinstance` checks.
+
+
+def _check_not_frozen(module: Module, key: str) -> None:
+    if module._frozen:
+        raise RuntimeError(
+            f"Cannot add '{key}' to frozen {type(module).__name__}; call train() first"
+        )
+
+
+def _set_parameter(module: Module, key: str, val: Any) -> None:
+    _check_not_frozen(module, key)
+    module._parameters[key] = val
+    module._invalidate_caches()
+
+
+def _set_module(module: Module, key: str, val: Any) -> None:
+    _check_not_frozen(module, key)
+    module._modules[key] = val
+    _add_parent(val, module)
+    module._invalidate_caches()
+
+
+def _add_parent(child: Module, parent: Module) -> None:
+    # A module replaced under some key keeps `parent` in its list; that only
+    # costs a spurious cache reset later. References to parents that have
+    # been collected are dropped whenever a new parent is added.
+    ref = weakref.ref(parent)
+    parents = child._parents
+    if parents is None:
+        _set_slot(child, "_parents", [ref])
+    elif ref not in parents:
+        parents[:] = [r for r in parents if r() is not None]
+        parents.append(ref)
+
+
+def _set_attribute(module: Module, key: str, val: Any) -> None:
+    object.__setattr__(module, key, val)
+
+
+_SETATTR_TABLE: Dict[type, Callable[[Module, str, Any], None]] = {
+    Parameter: _set_parameter,
+    Module: _set_module,
+}
+
+
+def _setattr_handler(t: type) -> Callable[[Module, str, Any], None]:
+    "Resolve and remember the handler for a type not yet in the table."
+    handler: Callable[[Module, str, Any], None]
+    if issubclass(t, Parameter):
+        handler = _set_parameter
+    elif issubclass(t, Module):
+        handler = _set_module
+    else:
+        handler = _set_attribute
+    _SETATTR_TABLE[t] = handler
+    return handler
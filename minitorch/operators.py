@@ -2,8 +2,17 @@
 Collection of the core mathematical operators used throughout the code base.
 """
 
+import builtins
 import math
-from typing import Callable, Iterable
+import operator
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Bound once so the hot scalar functions pay a single global lookup
+# instead of `math` plus an attribute lookup per call.
+_exp = math.exp
+_log = math.log
 
 # ## Task 0.1
 #
@@ -80,10 +89,7 @@ def lt(x: float, y: float) -> float:
     Returns:
         x < y as a float, 1.0/0 represting true/false
     """
-    if x < y:
-        return 1.0
-    else:
-        return 0.0
+    return 1.0 * (x < y)
 
 
 def eq(x: float, y: float) -> float:
@@ -98,10 +104,7 @@ def eq(x: float, y: float) -> float:
     Returns:
         x == y as 1.0/0.0 representing true/false
     """
-    if x == y:
-        return 1.0
-    else:
-        return 0.0
+    return 1.0 * (x == y)
 
 
 def max(x: float, y: float) -> float:
@@ -116,6 +119,9 @@ def max(x: float, y: float) -> float:
     Returns:
         x if x > y else y
     """
+    # Kept as a branch: for a single float this is cheaper than the
+    # branchless (x + y + |x - y|) / 2. The array path uses the same select
+    # (`np.where`), so nan compares the same way as here.
     if x > y:
         return x
     else:
@@ -134,10 +140,7 @@ def is_close(x: float, y: float) -> float:
     Returns:
         |x - y| < 1e-2
     """
-    if abs(x - y) < 1e-2:
-        return 1.0
-    else:
-        return 0.0
+    return 1.0 * (abs(x - y) < 1e-2)
 
 
 def sigmoid(x: float) -> float:
@@ -162,9 +165,10 @@ def sigmoid(x: float) -> float:
         sigmoid(x)
     """
     if x >= 0:
-        return 1.0 / (1.0 + exp(-x))
+        return 1.0 / (1.0 + _exp(-x))
     else:
-        return exp(x) / (1.0 + exp(x))
+        e = _exp(x)
+        return e / (1.0 + e)
 
 
 def relu(x: float) -> float:
@@ -181,6 +185,8 @@ def relu(x: float) -> float:
     Returns:
         relu(x)
     """
+    # Kept as a branch: the mask form x * (x > 0.0) gives nan for -inf and
+    # -0.0 for negatives. The array path is branch-free (see `_kernels.py`).
     if x > 0.0:
         return x
     else:
@@ -201,7 +207,7 @@ def log(x: float) -> float:
     Returns:
         log(x)
     """
-    return math.log(x + EPS)
+    return _log(x + EPS)
 
 
 def exp(x: float) -> float:
@@ -215,7 +221,7 @@ def exp(x: float) -> float:
     Returns:
         exp(x)
     """
-    return math.exp(x)
+    return _exp(x)
 
 
 def log_back(x: float, d: float) -> float:
@@ -232,7 +238,7 @@ def log_back(x: float, d: float) -> float:
 
         log_back(x, d) = d * f'(x)
     """
-    return d * inv(x)
+    return d / x
 
 
 def inv(x: float) -> float:
@@ -264,7 +270,7 @@ def inv_back(x: float, d: float) -> float:
         inv_back(x, d) = d * f'(x)
 
     """
-    return d * inv(x) ** 2
+    return d * (1.0 / x) ** 2
 
 
 def relu_back(x: float, d: float) -> float:
@@ -292,6 +298,129 @@ def relu_back(x: float, d: float) -> float:
 # Small practice library of elementary higher-order functions.
 
 
+# `_kernels` compiles the functions defined above, so it is imported only
+# now that they exist.
+from . import _kernels  # noqa: E402
+
+# Vectorized equivalents of the elementary functions above. The
+# higher-order functions below look `fn` up by identity and, when the
+# input is a long flat float sequence, apply the whole-array version in a
+# single NumPy call or compiled NUMBA kernel (see `_kernels.py`) instead
+# of calling `fn` once per element. Where Python raises (1 / 0.0,
+# exp(1000.0), log(-1.0), ...) these return inf or nan instead, so a
+# result that is not all finite is recomputed by the Python loop.
+_VECTORIZED_MAP: Dict[Callable[[float], float], Callable[[np.ndarray], Any]] = {
+    neg: np.negative,
+    relu: _kernels.unary(_kernels._relu_vec),
+    sigmoid: _kernels.unary(_kernels._sigmoid_vec),
+    exp: _kernels.unary(_kernels._exp_vec),
+    log: _kernels.unary(_kernels._log_vec),
+    inv: np.reciprocal,
+}
+
+_VECTORIZED_ZIP: Dict[
+    Callable[[float, float], float], Callable[[np.ndarray, np.ndarray], Any]
+] = {
+    add: np.add,
+    mul: np.multiply,
+    lt: lambda a, b: np.less(a, b).astype(np.float64),
+    eq: lambda a, b: np.equal(a, b).astype(np.float64),
+    max: lambda a, b: np.where(a > b, a, b),
+    log_back: _kernels.binary(_kernels._log_back_vec),
+    inv_back: _kernels.binary(_kernels._inv_back_vec),
+    relu_back: _kernels.binary(_kernels._relu_back_vec),
+}
+
+_VECTORIZED_REDUCE: Dict[
+    Tuple[Callable[[float, float], float], float], Callable[[np.ndarray], Any]
+] = {
+    (add, 0): np.sum,
+    (mul, 1): np.prod,
+}
+
+
+# C implementations (from `operator` / `builtins`) of the polymorphic
+# primitives. These also work on non-floats, so the generic paths of the
+# higher-order functions use them in place of the Python definitions.
+_BUILTIN_MAP: Dict[Callable[[Any], Any], Callable[[Any], Any]] = {
+    neg: operator.neg,
+}
+
+_BUILTIN_ZIP: Dict[Callable[[Any, Any], Any], Callable[[Any, Any], Any]] = {
+    add: operator.add,
+    mul: operator.mul,
+}
+
+
+def _sum(ls: Iterable[Any], start: Any) -> Any:
+    """
+    Add up `ls` onto `start`. Float sequences use `math.fsum`, which rounds
+    the exact sum once instead of once per addition; anything else uses
+    `builtins.sum`, which keeps ints exact.
+    """
+    if not isinstance(ls, (list, tuple)):
+        ls = list(ls)
+    if ls and type(ls[0]) is float:
+        try:
+            return start + math.fsum(ls)
+        except (TypeError, ValueError, OverflowError):
+            # Non-numbers further on (e.g. `Scalar`), or inf - inf and
+            # overflow, which `builtins.sum` turns into nan / inf.
+            pass
+    return builtins.sum(ls, start)
+
+
+_BUILTIN_REDUCE: Dict[
+    Callable[[Any, Any], Any], Callable[[Iterable[Any], Any], Any]
+] = {
+    add: _sum,
+    mul: lambda ls, start: math.prod(ls, start=start),
+}
+
+
+# Converting a list to an array and back costs about as much per element
+# as calling a C `operator` function or a comparison, so for most
+# primitives the array path only pays off on inputs that already are
+# arrays. The primitives below do enough work per element to break even
+# on lists at ~100-200 elements.
+_VECTORIZE_MIN_SIZE = 256
+_VECTORIZE_LISTS = {sigmoid, exp, log, inv, inv_back}
+
+
+def _as_array(
+    ls: Iterable[float], min_size: Optional[int] = _VECTORIZE_MIN_SIZE
+) -> Optional[np.ndarray]:
+    """
+    View `ls` as a flat float64 array if it is a float array, or a list or
+    tuple of at least `min_size` floats (never if `min_size` is None).
+    Otherwise return None so callers take the generic Python path. Ints
+    and bools are left to Python so they stay exact.
+    """
+    if not isinstance(ls, np.ndarray) and (
+        not isinstance(ls, (list, tuple)) or min_size is None or len(ls) < min_size
+    ):
+        return None
+    try:
+        arr = np.asarray(ls)
+    except ValueError:
+        # Ragged nested sequences.
+        return None
+    if arr.ndim != 1 or arr.dtype.kind != "f":
+        return None
+    return arr.astype(np.float64, copy=False)
+
+
+def _finite_list(out: np.ndarray) -> Optional[List[float]]:
+    """
+    Convert the result of a vectorized call back to a list, or return None
+    if it holds inf or nan, where the Python definition may raise or give a
+    different value instead.
+    """
+    if not np.isfinite(out).all():
+        return None
+    return out.tolist()
+
+
 def map(fn: Callable[[float], float]) -> Callable[[Iterable[float]], Iterable[float]]:
     """
     Higher-order map.
@@ -306,12 +435,20 @@ def map(fn: Callable[[float], float]) -> Callable[[Iterable[float]], Iterable[fl
          returns a new list
     """
 
+    vec_fn = _VECTORIZED_MAP.get(fn)
+    loop_fn = _BUILTIN_MAP.get(fn, fn)
+    min_size = _VECTORIZE_MIN_SIZE if fn in _VECTORIZE_LISTS else None
+
     def apply(ls: Iterable[float]):
-        new_ls = []
-        for e in ls:
-            e_prime = fn(e)
-            new_ls.append(e_prime)
-        return new_ls
+        if vec_fn is not None:
+            arr = _as_array(ls, min_size)
+            if arr is not None:
+                with np.errstate(all="ignore"):
+                    res = _finite_list(vec_fn(arr))
+                if res is not None:
+                    return res
+
+        return list(builtins.map(loop_fn, ls))
 
     return apply
 
@@ -347,18 +484,24 @@ def zipWith(
 
     """
 
+    vec_fn = _VECTORIZED_ZIP.get(fn)
+    loop_fn = _BUILTIN_ZIP.get(fn, fn)
+    min_size = _VECTORIZE_MIN_SIZE if fn in _VECTORIZE_LISTS else None
+
     def apply(ls1, ls2):
         assert len(ls1) == len(
             ls2
         ), f"Need to be same size, \
                                     {len(ls1)} != {len(ls2)}"
-        new_ls = []
+        if vec_fn is not None:
+            arr1, arr2 = _as_array(ls1, min_size), _as_array(ls2, min_size)
+            if arr1 is not None and arr2 is not None:
+                with np.errstate(all="ignore"):
+                    res = _finite_list(vec_fn(arr1, arr2))
+                if res is not None:
+                    return res
 
-        for e1, e2 in zip(ls1, ls2):
-            new_e = fn(e1, e2)
-            new_ls.append(new_e)
-
-        return new_ls
+        return list(builtins.map(loop_fn, ls1, ls2))
 
     return apply
 
@@ -395,7 +538,23 @@ def reduce(
         fn(x_1, x_0)))`
     """
 
+    # `sum` / `math.prod` fold as start + x_1 + ... + x_n, which only matches
+    # fn(x_n, ... fn(x_1, x_0)) for commutative (numeric) operands; strings,
+    # lists and the like keep the element-wise loop.
+    numeric = isinstance(start, (int, float))
+    vec_fn = _VECTORIZED_REDUCE.get((fn, start)) if numeric else None
+    builtin_fn = _BUILTIN_REDUCE.get(fn) if numeric else None
+
     def apply(ls):
+        # Plain iterables go through `_sum` and `math.prod`; only existing
+        # arrays are handed to NumPy directly.
+        if vec_fn is not None and isinstance(ls, np.ndarray):
+            arr = _as_array(ls)
+            if arr is not None:
+                return float(vec_fn(arr))
+        if builtin_fn is not None:
+            return builtin_fn(ls, start)
+
         res = start
         for e in ls:
             res = fn(e, res)
@@ -433,3 +592,45 @@ def prod(ls: Iterable[float]) -> float:
     """
     prod_fn = reduce(mul, start=1)
     return prod_fn(ls)
+
+
+# ## Compiled scalar operators
+#
+# If the optional Cython extension (`operators_c.pyx`) has been built, the
+# float-only primitives above are rebound to their compiled versions. The
+# JIT backends cannot compile those, so they look up the pure Python
+# definition through `python_impl`.
+
+_PYTHON_IMPLS: Dict[Callable[..., Any], Callable[..., Any]] = {}
+
+
+def python_impl(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Return the pure Python definition of an operator.
+
+    Args:
+        fn: an operator from this module (compiled or not) or any function.
+
+    Returns:
+        The Python function `fn` replaced, or `fn` itself.
+    """
+    return _PYTHON_IMPLS.get(fn, fn)
+
+
+try:
+    from . import operators_c  # type: ignore
+except ImportError:
+    operators_c = None
+
+if operators_c is not None:
+    for _name in operators_c.__all__:
+        _py_fn = globals()[_name]
+        _c_fn = getattr(operators_c, _name)
+        _PYTHON_IMPLS[_c_fn] = _py_fn
+        if _py_fn in _VECTORIZED_MAP:
+            _VECTORIZED_MAP[_c_fn] = _VECTORIZED_MAP[_py_fn]
+        if _py_fn in _VECTORIZED_ZIP:
+            _VECTORIZED_ZIP[_c_fn] = _VECTORIZED_ZIP[_py_fn]
+        if _py_fn in _VECTORIZE_LISTS:
+            _VECTORIZE_LISTS.add(_c_fn)
+        globals()[_name] = _c_fn
@@ -0,0 +1,94 @@
+# cython: language_level=3
+"""
+Compiled versions of the float-only scalar primitives in `operators.py`.
+
+Optional: build with `python setup.py build_ext --inplace` (requires
+Cython and a C compiler). When the extension is importable, `operators.py`
+rebinds these names to the compiled functions. They take and return C
+doubles and raise the same errors as the Python versions (`ValueError`
+for `log` outside its domain, `OverflowError` from `exp` / `inv_back`,
+`ZeroDivisionError` from the divisions). The helpers that may return their
+argument unchanged (`id`, `add`, `mul`, `neg`, `max`, `relu`, `relu_back`)
+stay in Python, since they are also applied to ints and other non-floats.
+"""
+
+from libc.math cimport exp as cexp
+from libc.math cimport fabs, isinf
+from libc.math cimport log as clog
+
+from minitorch.operators import EPS as _EPS
+
+cdef double EPS = _EPS
+
+__all__ = [
+    "lt",
+    "eq",
+    "is_close",
+    "sigmoid",
+    "log",
+    "exp",
+    "log_back",
+    "inv",
+    "inv_back",
+]
+
+
+cpdef double lt(double x, double y) nogil:
+    "$f(x) =$ 1.0 if x is less than y else 0.0"
+    return 1.0 if x < y else 0.0
+
+
+cpdef double eq(double x, double y) nogil:
+    "$f(x) =$ 1.0 if x is equal to y else 0.0"
+    return 1.0 if x == y else 0.0
+
+
+cpdef double is_close(double x, double y) nogil:
+    "$f(x) = |x - y| < 1e-2$"
+    return 1.0 if fabs(x - y) < 1e-2 else 0.0
+
+
+cpdef double sigmoid(double x) nogil:
+    r"$f(x) =  \frac{1.0}{(1.0 + e^{-x})}$"
+    cdef double e
+    if x >= 0:
+        return 1.0 / (1.0 + cexp(-x))
+    e = cexp(x)
+    return e / (1.0 + e)
+
+
+cpdef double log(double x) except? -1.0 nogil:
+    "$f(x) = log(x)$"
+    if x + EPS <= 0.0:
+        with gil:
+            raise ValueError("math domain error")
+    return clog(x + EPS)
+
+
+cpdef double exp(double x) except? -1.0 nogil:
+    "$f(x) = e^{x}$"
+    cdef double r = cexp(x)
+    if isinf(r) and not isinf(x):
+        with gil:
+            raise OverflowError("math range error")
+    return r
+
+
+cpdef double inv(double x) except? -1.0 nogil:
+    "$f(x) = 1/x$"
+    return 1.0 / x
+
+
+cpdef double log_back(double x, double d) except? -1.0 nogil:
+    r"If $f = log$ as above, compute $d \times f'(x)$"
+    return d / x
+
+
+cpdef double inv_back(double x, double d) except? -1.0 nogil:
+    r"If $f(x) = 1/x$ compute $d \times f'(x)$"
+    cdef double i = 1.0 / x
+    cdef double i2 = i * i
+    if isinf(i2) and not isinf(i):
+        with gil:
+            raise OverflowError("Numerical result out of range")
+    return d * i2
@@ -33,13 +33,12 @@ class MyModule(minitorch.Module):
     stack = [(out, "base")]
 
     while stack:
-        n, name = stack[0]
-        stack = stack[1:]
-        for pname, p in n.__dict__["_parameters"].items():
+        n, name = stack.pop()
+        for pname, p in n._parameters.items():
             G.add_node(name + "." + pname, shape="rect", penwidth=0.5)
             G.add_edge(name, name + "." + pname)
 
-        for cname, m in n.__dict__["_modules"].items():
+        for cname, m in n._modules.items():
             G.add_edge(name, name + "." + cname)
             stack.append((m, name + "." + cname))
 
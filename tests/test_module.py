@@ -1,3 +1,7 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
 import pytest
 from hypothesis import given
 
@@ -137,6 +141,110 @@ def test_stacked_module(size_a: int, size_b: int, val: float) -> None:
     assert named_parameters["module_b.parameter_b"].value == VAL_B
 
 
+@pytest.mark.task0_4
+def test_parameters_cache_invalidated() -> None:
+    "Changing any part of the tree must show up in the memoized traversals"
+    mod = ModuleA1()
+    assert len(mod.parameters()) == 3
+    assert len(dict(mod.named_parameters())) == 3
+    assert "(d)" not in repr(mod)
+
+    mod.b.c.add_parameter("p4", 20)
+    mod.a.p5 = minitorch.Parameter(25)
+    mod.b.d = ModuleA2()
+    assert len(mod.parameters()) == 6
+    np = dict(mod.named_parameters())
+    assert np["b.c.p4"].value == 20
+    assert np["a.p5"].value == 25
+    assert np["b.d.p2"].value == 10
+    assert "(d): ModuleA2()" in repr(mod)
+
+    # Changes made while a traversal is still being consumed.
+    mod = ModuleA1()
+    it = mod.named_parameters()
+    next(it)
+    next(it)
+    mod.p9 = minitorch.Parameter(9.0)
+    list(it)
+    assert len(mod.parameters()) == 4
+    assert dict(mod.named_parameters())["p9"].value == 9.0
+
+
+@pytest.mark.task0_4
+def test_shared_child_cache_invalidated() -> None:
+    "A module shared by several parents must invalidate all of them"
+    shared = ModuleA2()
+    a = minitorch.Module()
+    b = minitorch.Module()
+    a.s = shared
+    b.s = shared
+    assert len(a.parameters()) == 1
+    assert len(b.parameters()) == 1
+    assert "(extra)" not in repr(a)
+
+    shared.extra = ModuleA4()
+    for mod in (a, b):
+        assert len(mod.parameters()) == 2
+        assert sorted(dict(mod.named_parameters())) == ["s.extra.p3", "s.p2"]
+        assert "(extra): ModuleA4()" in repr(mod)
+
+
+@pytest.mark.task0_4
+def test_freeze() -> None:
+    "Frozen modules keep their parameters but reject new ones until train()"
+    mod = ModuleA1()
+    mod.eval()
+    mod.freeze()
+    assert len(mod.parameters()) == 3
+    np = dict(mod.named_parameters())
+    assert np["b.c.p3"].value == 15
+
+    with pytest.raises(RuntimeError):
+        mod.b.c.p4 = minitorch.Parameter(20)
+    with pytest.raises(RuntimeError):
+        mod.a.add_parameter("p5", 25)
+    mod.non_param = 11
+    assert mod.non_param == 11
+
+    mod.train()
+    mod.b.c.p4 = minitorch.Parameter(20)
+    assert dict(mod.named_parameters())["b.c.p4"].value == 20
+
+
+@pytest.mark.task0_4
+def test_pack_parameters() -> None:
+    "Packed parameters are views into one array updated in a single step"
+    mod = ModuleA1()
+    mod.p1.update(5.0)
+    mod.a.p2.update(10.0)
+    mod.b.c.p3.update(15.0)
+    mod.a.count = minitorch.Parameter(3)
+    mod.b.flag = minitorch.Parameter(True)
+    pack = mod.pack_parameters()
+    assert sorted(pack.names) == ["a.p2", "b.c.p3", "p1"]
+    assert sorted(pack.values.tolist()) == [5.0, 10.0, 15.0]
+
+    pack.grads[:] = 1.0
+    pack.step(0.5)
+    assert mod.p1.value == 4.5
+    assert mod.a.p2.value == 9.5
+    assert mod.b.c.p3.value == 14.5
+    assert mod.a.count.value == 3 and type(mod.a.count.value) is int
+    assert mod.b.flag.value is True
+
+    # A parameter shared under two names gets a single slot.
+    shared = minitorch.Module()
+    shared.w = minitorch.Parameter(1.0)
+    root = minitorch.Module()
+    root.a = shared
+    root.b = shared
+    pack = root.pack_parameters()
+    assert len(pack.names) == 1 and pack.values.shape == (1,)
+    pack.grads[:] = 1.0
+    pack.step(0.25)
+    assert shared.w.value == 0.75
+
+
 # ## Misc Tests
 
 # Check that the module runs forward correctly.
@@ -163,6 +271,52 @@ def test_module_forward() -> None:
     assert mod() == 10
 
 
+class ModuleScale(minitorch.Module):
+    def __init__(self, k: int) -> None:
+        super().__init__()
+        self.k = k
+
+    def forward(self, x: int) -> int:
+        return self.k * x
+
+
+class ModuleFanOut(minitorch.Module):
+    def __init__(self) -> None:
+        super().__init__()
+        self.a = ModuleScale(2)
+        self.b = ModuleScale(3)
+        self.c = ModuleScale(5)
+
+
+@pytest.mark.task0_4
+def test_module_parallel_forward() -> None:
+    mod = ModuleFanOut()
+    assert mod.parallel_forward(["c", "a", "b"], 7) == [35, 14, 21]
+
+
+class ModuleNestedFanOut(ModuleFanOut):
+    def forward(self, x: int) -> List[int]:
+        return self.parallel_forward(["a", "b", "c"], x)
+
+
+@pytest.mark.task0_4
+def test_module_parallel_forward_threaded(monkeypatch: pytest.MonkeyPatch) -> None:
+    "The thread pool path, with nested calls outnumbering the workers"
+    monkeypatch.setattr(sys, "_is_gil_enabled", lambda: False, raising=False)
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(minitorch.Module, "_executor", executor)
+    try:
+        mod = ModuleFanOut()
+        assert mod.parallel_forward(["c", "a", "b"], 7) == [35, 14, 21]
+
+        outer = minitorch.Module()
+        outer.x = ModuleNestedFanOut()
+        outer.y = ModuleNestedFanOut()
+        assert outer.parallel_forward(["x", "y"], 1) == [[2, 3, 5], [2, 3, 5]]
+    finally:
+        executor.shutdown()
+
+
 # Internal check for the system.
 
 
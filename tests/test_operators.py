@@ -1,28 +1,37 @@
+import builtins
+import itertools
+import math
 from typing import Callable, List, Tuple
 
+import numpy as np
 import pytest
 from hypothesis import given
 from hypothesis.strategies import lists
 
-from minitorch import MathTest
+from minitorch import MathTest, _kernels, operators
 from minitorch.operators import (
     add,
     addLists,
     eq,
+    exp,
     id,
     inv,
     inv_back,
+    log,
     log_back,
     lt,
+    map,
     max,
     mul,
     neg,
     negList,
     prod,
+    reduce,
     relu,
     relu_back,
     sigmoid,
     sum,
+    zipWith,
 )
 
 from .strategies import assert_close, small_floats
@@ -52,6 +61,19 @@ def test_relu(a: float) -> None:
         assert relu(a) == 0.0
 
 
+@pytest.mark.task0_1
+def test_relu_non_finite() -> None:
+    "relu must not turn -inf into nan or negatives into -0.0, in any path."
+    inf = float("inf")
+    assert relu(-inf) == 0.0
+    assert math.copysign(1.0, relu(-1.0)) == 1.0
+    assert relu_back(-1.0, inf) == 0.0
+    xs = [-inf, inf, -2.0, 3.0, float("nan")] * 32
+    assert map(relu)(xs) == [relu(x) for x in xs]
+    back = zipWith(relu_back)(xs, [1.0] * len(xs))
+    assert back == [relu_back(x, 1.0) for x in xs]
+
+
 @pytest.mark.task0_1
 @given(small_floats, small_floats)
 def test_relu_back(a: float, b: float) -> None:
@@ -213,6 +235,131 @@ def test_negList(ls: List[float]) -> None:
         assert_close(i, -j)
 
 
+@pytest.mark.task0_3
+@given(lists(small_floats, min_size=1), lists(small_floats, min_size=1))
+def test_vectorized_matches_python(ls1: List[float], ls2: List[float]) -> None:
+    "The NumPy fast path must agree with the element-wise definitions."
+    # Long enough for lists to take the vectorized path; arrays always do.
+    size = builtins.max(len(ls1), 256)
+    ls1 = (ls1 * size)[:size]
+    ls2 = (ls2 * size)[:size]
+    for xs, ds in [(ls1, ls2), (np.array(ls1), np.array(ls2))]:
+        for fn in [neg, relu, sigmoid]:
+            for x, y in zip(map(fn)(xs), ls1):
+                assert_close(x, fn(y))
+        for x, y in zip(map(exp)(abs(np.array(xs)) / 100), ls1):
+            assert_close(x, exp(abs(y) / 100))
+        for x, y in zip(map(log)(abs(np.array(xs)) + 1), ls1):
+            assert_close(x, log(abs(y) + 1))
+        for fn2 in [add, mul, lt, eq, max, relu_back]:
+            for x, a, b in zip(zipWith(fn2)(xs, ds), ls1, ls2):
+                assert_close(x, fn2(a, b))
+        pos = abs(np.array(xs)) + 4
+        for fn2 in [inv_back, log_back]:
+            for x, a, b in zip(zipWith(fn2)(pos, ds), pos, ls2):
+                assert_close(x, fn2(a, b))
+
+
+@pytest.mark.task0_3
+def test_vectorized_special_values() -> None:
+    "Zero, nan and inf give the Python results, or errors, on every path."
+    inf, nan = float("inf"), float("nan")
+    special = [0.0, -0.0, 1.0, -1.0, inf, -inf, nan] * 40
+    shifted = special[3:] + special[:3]
+
+    def same(xs: List[float], ys: List[float]) -> bool:
+        return all(x == y or (math.isnan(x) and math.isnan(y)) for x, y in zip(xs, ys))
+
+    for xs, ds in [(special, shifted), (np.array(special), np.array(shifted))]:
+        for fn in [neg, relu, sigmoid, exp]:
+            assert same(map(fn)(xs), [fn(x) for x in special])
+        for fn2 in [add, mul, lt, eq, max, relu_back]:
+            assert same(
+                zipWith(fn2)(xs, ds), [fn2(x, d) for x, d in zip(special, shifted)]
+            )
+        assert zipWith(max)(xs, [1.0] * len(xs))[6] == max(nan, 1.0) == 1.0
+
+    zeros = [0.0] * 256
+    with pytest.raises(ZeroDivisionError):
+        map(inv)(zeros)
+    with pytest.raises(ZeroDivisionError):
+        zipWith(inv_back)(zeros, [1.0] * len(zeros))
+
+
+@pytest.mark.task0_3
+def test_kernels_match_python_errors() -> None:
+    "Out-of-domain input raises like Python, and each kernel variant has its own cache."
+    with pytest.raises(ValueError):
+        map(log)([-1.0] * 256)
+    with pytest.raises(OverflowError):
+        map(exp)([1000.0] * 256)
+
+    kernel = _kernels._exp_vec
+    serial, parallel = kernel.serial, kernel.parallel
+    assert parallel.targetoptions.get("parallel")
+    assert not serial.targetoptions.get("parallel")
+    assert (
+        serial._cache._cache_file._index_name != parallel._cache._cache_file._index_name
+    )
+
+
+@pytest.mark.task0_1
+def test_compiled_operators_match_python() -> None:
+    "The optional Cython operators return and raise like the Python ones."
+    if operators.operators_c is None:
+        pytest.skip("operators_c is not built")
+    inf, nan = float("inf"), float("nan")
+    values = [0.0, -1.0, 2, -1e-6, 1e-200, 1000.0, inf, -inf, nan]
+
+    def run(fn: Callable[..., float], *args: float) -> object:
+        try:
+            res = fn(*args)
+        except (ArithmeticError, ValueError) as e:
+            return type(e)
+        return "nan" if math.isnan(res) else (type(res), res)
+
+    for name in operators.operators_c.__all__:
+        compiled = getattr(operators, name)
+        python = operators.python_impl(compiled)
+        args = [values] * python.__code__.co_argcount
+        for xs in itertools.product(*args):
+            assert run(compiled, *xs) == run(python, *xs), (name, xs)
+
+
+@pytest.mark.task0_3
+def test_higher_order_non_floats() -> None:
+    "Ints stay exact and non-numeric lists keep the element-wise definitions."
+    ints = list(range(100))
+    assert negList(ints) == [-i for i in ints]
+    assert all(type(i) is int for i in negList(ints))
+    big = [2**60 + 1] * 100
+    assert addLists(big, [0] * 100) == big
+    ragged = [[1], [2, 3]] * 50
+    assert addLists(ragged, ragged) == [x + x for x in ragged]
+
+
+@pytest.mark.task0_3
+def test_sum_correctly_rounded() -> None:
+    "Float sums are correctly rounded; ints and other types are summed as before."
+    tenths = [0.1] * 10
+    assert sum(tenths) == math.fsum(tenths) != builtins.sum(tenths)
+    floats = [(-1.0) ** i * 10.0**i for i in range(-5, 20)]
+    assert sum(floats) == math.fsum(floats)
+    assert math.isnan(sum([float("inf"), -float("inf")]))
+    big = [2**60 + 1] * 20
+    assert sum(big) == builtins.sum(big)
+    assert type(sum(list(range(100)))) is int
+    assert sum([0.5, 0.25]) == 0.75
+    assert sum([]) == 0
+
+
+@pytest.mark.task0_3
+def test_reduce_non_numeric_start() -> None:
+    "Non-numeric starts keep the fn(x_i, acc) order of the definition."
+    assert reduce(add, "")(["a", "b"]) == "ba"
+    assert reduce(add, [])([[1], [2], [3]]) == [3, 2, 1]
+
+
 # ## Generic mathematical tests
 
 # For each unit this generic set of mathematical tests will run.